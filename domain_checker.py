@@ -1,11 +1,140 @@
+import argparse
+import contextlib
+import errno
+import io
+import json
+import os
+import re
+import socket
+import sys
+import threading
 import time
-import whois
-import datetime  # Need this for date formatting
+from collections import defaultdict
+from types import SimpleNamespace
+# Note: whois, datetime, dnspython and the modules only some paths need (asyncio,
+# concurrent.futures, urllib.request, http.client, multiprocessing, selectors,
+# tempfile) are imported inside the functions that use them, so startup stays
+# fast on paths that never do a lookup (e.g. empty input or --help)
 
 # List of TLDs known to sometimes cause issues or timeouts with python-whois
 # You might need to adjust this list based on experience
 # Reference: Observed behavior and potential library limitations
-KNOWN_PROBLEMATIC_TLDS = {'.io', '.co', '.ai', '.gg', '.so', '.is'}
+KNOWN_PROBLEMATIC_TLDS = frozenset({'.io', '.co', '.ai', '.gg', '.so', '.is'})  # Lowercase
+
+# Fail fast on unresponsive WHOIS servers instead of waiting on the library defaults
+WHOIS_TIMEOUT = 3.0  # Seconds per connection attempt
+WHOIS_RETRIES = 3  # Total attempts per lookup
+socket.setdefaulttimeout(WHOIS_TIMEOUT)
+
+# Registry WHOIS servers for common TLDs; these are queried directly over port 43
+# and the raw reply is handed to python-whois' parser
+TLD_SERVER = {
+    '.com': 'whois.verisign-grs.com',
+    '.net': 'whois.verisign-grs.com',
+    '.org': 'whois.publicinterestregistry.org',
+    '.app': 'whois.nic.google',
+    '.dev': 'whois.nic.google',
+    '.xyz': 'whois.nic.xyz',
+    '.us': 'whois.nic.us',
+    '.uk': 'whois.nic.uk',
+}
+
+# Other TLDs are looked up once via IANA's referral WHOIS ('whois: <server>' line)
+# and remembered across runs in _TLD_SERVER_CACHE
+IANA_WHOIS_SERVER = 'whois.iana.org'
+TLD_SERVER_CACHE_FILE = os.path.join(os.path.expanduser('~'), '.cache', 'domain_checker_tlds.json')
+_RE_IANA_REFERRAL = re.compile(r'^whois:[ \t]*(\S+)', re.MULTILINE | re.IGNORECASE)
+
+def _load_tld_server_cache():
+    try:
+        with open(TLD_SERVER_CACHE_FILE) as f:
+            return json.load(f)
+    except (OSError, ValueError):
+        return {}
+
+_TLD_SERVER_CACHE = _load_tld_server_cache()  # TLD -> server (None if IANA lists no WHOIS server)
+_tld_server_cache_lock = threading.Lock()  # One IANA bootstrap at a time, so no TLD is queried twice
+
+def _save_tld_server_cache():
+    """Persists bootstrapped TLD servers so later runs skip the IANA query.
+
+    Called after every bootstrap rather than at exit, since atexit handlers don't
+    run in multiprocessing pool workers. Entries saved meanwhile by another run
+    are kept, and the file is replaced atomically so it's never left truncated.
+    """
+    import tempfile
+    cache = _load_tld_server_cache()
+    cache.update(_TLD_SERVER_CACHE)
+    cache_dir = os.path.dirname(TLD_SERVER_CACHE_FILE)
+    try:
+        os.makedirs(cache_dir, exist_ok=True)
+        fd, tmp_path = tempfile.mkstemp(dir=cache_dir, suffix='.tmp')
+        try:
+            with os.fdopen(fd, 'w') as f:
+                json.dump(cache, f, indent=2, sort_keys=True)
+            os.replace(tmp_path, TLD_SERVER_CACHE_FILE)
+        except BaseException:
+            os.unlink(tmp_path)
+            raise
+    except OSError as e:
+        print(f"[!] Could not save TLD server cache: {e}", file=sys.stderr)
+
+# TLDs whose registries use the standard 'Key: value' reply format, parsed with
+# the precompiled regexes below instead of python-whois' generic parser.
+# [ \t]* rather than \s* so an empty field doesn't capture the next line.
+FAST_WHOIS_TLDS = frozenset({'.com', '.net', '.org'})
+_RE_DOMAIN = re.compile(r'^\s*Domain Name:[ \t]*(\S.*)$', re.MULTILINE | re.IGNORECASE)
+_RE_REGISTRAR = re.compile(r'^\s*Registrar:[ \t]*(\S.*)$', re.MULTILINE | re.IGNORECASE)
+_RE_CREATED = re.compile(r'^\s*Creation Date:[ \t]*(\S.*)$', re.MULTILINE | re.IGNORECASE)
+_RE_UPDATED = re.compile(r'^\s*Updated Date:[ \t]*(\S.*)$', re.MULTILINE | re.IGNORECASE)
+
+# WHOIS error messages that mean the domain isn't registered
+_AVAIL_RE = re.compile(r"no match for|no whois server is known for|domain not found", re.IGNORECASE)
+
+# Replies indicating the WHOIS server is throttling us
+_RATE_LIMIT_RE = re.compile(r"limit exceeded|quota exceeded|too many requests|try again later", re.IGNORECASE)
+
+# Resolved [(family, address), ...] per WHOIS server host. WHOIS servers close
+# the connection after each reply (RFC 3912), so sockets can't be kept alive;
+# reusing the resolved addresses at least saves a DNS lookup per query.
+_server_addrs = {}
+
+# Minimum seconds between two queries to the same WHOIS server. Rate limits are
+# per server, so TLDs on different registries are never delayed by each other.
+SERVER_QUERY_INTERVAL = 1.0
+_last_query = {}  # Server -> time.monotonic() of its last query
+_server_locks = defaultdict(threading.Lock)  # Serializes queries to the same server
+
+# Memoized format_date output; registries often return the same dates across lookups
+_fmt_cache = {}
+
+# Lifetime (seconds) of the DNS NS probe done before WHOIS
+DNS_TIMEOUT = 2.0
+
+# Maximum number of WHOIS lookups allowed in flight at the same time (default for --concurrency)
+MAX_CONCURRENT_LOOKUPS = 8
+
+# TLDs checked when none are specified
+DEFAULT_TLDS = ['.com', '.net', '.org']
+
+# How lookups are parallelized: 'asyncio' (default, worker threads), 'process'
+# (a multiprocessing pool, for when asyncio can't be used or WHOIS parsing is the bottleneck)
+# or 'selectors' (raw WHOIS sockets polled from a single thread, see bulk_whois)
+BACKEND = os.environ.get('DOMAIN_CHECKER_BACKEND', 'asyncio')
+
+# Optional Redis cache for WHOIS results, enabled with DOMAIN_CHECKER_REDIS=1.
+# Install with `pip install redis[hiredis]`; redis-py picks up the faster hiredis parser automatically.
+CACHE_TTL = 3600  # Seconds a cached result stays valid
+_redis = None
+if os.environ.get('DOMAIN_CHECKER_REDIS') == '1':
+    import redis
+    _redis = redis.Redis(decode_responses=True)
+_redis_error_reported = False
+_redis_error_lock = threading.Lock()
+
+# Bulk availability API (WhoisXML). Used instead of per-domain WHOIS when an API key is set.
+BULK_API_URL = 'https://domain-availability.whoisxmlapi.com/api/v1/bulk'
+BULK_API_KEY_ENV = 'WHOISXML_API_KEY'
 
 
 def format_date(date_obj):
@@ -18,85 +147,798 @@ def format_date(date_obj):
         # Take the first date if it's a list (common occurrence in whois data)
         date_obj = date_obj[0] if date_obj else None # Handle empty list
     
+    import datetime
     if isinstance(date_obj, datetime.datetime):
-        return date_obj.strftime('%Y-%m-%d %H:%M:%S')
+        # Drop tzinfo so aware datetimes don't gain a UTC offset suffix, and so the cache
+        # key is the local wall time (aware datetimes for the same instant compare equal)
+        naive = date_obj.replace(tzinfo=None)
+        if naive not in _fmt_cache:
+            # Same output as strftime('%Y-%m-%d %H:%M:%S') without the locale-aware formatter
+            _fmt_cache[naive] = naive.isoformat(sep=' ', timespec='seconds')
+        return _fmt_cache[naive]
     elif isinstance(date_obj, datetime.date):
-        return date_obj.strftime('%Y-%m-%d')
+        if date_obj not in _fmt_cache:
+            _fmt_cache[date_obj] = date_obj.isoformat()
+        return _fmt_cache[date_obj]
     return str(date_obj) # Fallback if it's not a recognized date/time object or None
 
-def check_domain(domain_name, tld):
-    """Checks the availability and WHOIS details of a single domain.
+def _resolve_server(server):
+    """Returns every (family, sockaddr) for a WHOIS server's port 43, resolving it only once.
 
-    Args:
-        domain_name (str): The base domain name (e.g., 'example').
-        tld (str): The top-level domain, including the dot (e.g., '.com').
+    The result is kept in _server_addrs so later queries to the same registry
+    (e.g. .com and .net on Verisign) skip the DNS lookup.
+    """
+    if server not in _server_addrs:
+        _server_addrs[server] = [(family, sockaddr) for family, _, _, _, sockaddr
+                                 in socket.getaddrinfo(server, 43, type=socket.SOCK_STREAM)]
+    return _server_addrs[server]
+
+def _connect(server):
+    """Connects to a WHOIS server, trying each resolved address in turn like socket.create_connection.
+
+    Unlike create_connection, the addresses come from _resolve_server's cache, so
+    an unreachable first address (e.g. IPv6 without a route) falls through to the next.
+    """
+    last_error = None
+    for family, sockaddr in _resolve_server(server):
+        sock = socket.socket(family, socket.SOCK_STREAM)
+        sock.settimeout(WHOIS_TIMEOUT)
+        try:
+            sock.connect(sockaddr)
+            return sock
+        except OSError as e:
+            sock.close()
+            last_error = e
+    raise last_error or OSError(f"No addresses found for {server}")
+
+def raw_whois(server, domain):
+    """Sends a single WHOIS query to server on port 43 and returns the raw reply text.
+
+    Raises:
+        ConnectionError: If the server closes the connection without replying
+            (rate-limiting registries do this), so the query is retried instead of
+            the empty reply being read as 'not registered'.
+    """
+    chunks = []
+    try:
+        with _connect(server) as sock:
+            # IDNs go out in their ASCII (punycode) form, the only one registries match
+            sock.sendall(domain.encode('idna') + b"\r\n")
+            # The server closes the connection once the full reply has been sent
+            while chunk := sock.recv(4096):
+                chunks.append(chunk)
+    except OSError:
+        # Forget the addresses in case the server has moved
+        _server_addrs.pop(server, None)
+        raise
+    text = b''.join(chunks).decode('utf-8', errors='replace')
+    if not text.strip():
+        raise ConnectionError(f"Empty reply from {server}")
+    return text
+
+def nic_whois(server, domain):
+    """Like raw_whois, but sends the query through python-whois' NICClient.
+
+    NICClient adds the query syntax some registries require, e.g. a '/e' suffix
+    for whois.jprs.jp (which otherwise replies in Japanese) or '-T dn,ace' for
+    whois.denic.de. Used for servers bootstrapped from IANA, whose syntax isn't known.
+    """
+    import whois
+    text = whois.NICClient().whois(domain.encode('idna').decode('ascii'), server, 0,
+                                   timeout=WHOIS_TIMEOUT, ignore_socket_errors=False)
+    if not text.strip():
+        raise ConnectionError(f"Empty reply from {server}")
+    return text
+
+def _parse_whois_date(value):
+    """Converts an ISO 8601 WHOIS date (e.g. '1997-09-15T04:00:00Z') to a datetime, or returns it unchanged."""
+    import datetime
+    try:
+        return datetime.datetime.fromisoformat(value.replace('Z', '+00:00'))
+    except ValueError:
+        return value
+
+def fast_whois(text):
+    """Parses a raw WHOIS reply in the standard registry format using precompiled regexes.
 
     Returns:
-        dict: A dictionary containing 'status' ('Registered', 'Available', 'Error', 'Skipped')
-              and potentially 'registrar', 'creation_date', 'updated_date', 'message' (for errors).
+        SimpleNamespace or None: An object with the same attributes check_domain reads from
+        python-whois results ('domain_name' is None if the domain isn't registered), or None
+        if the reply isn't in a recognized format.
     """
-    full_domain = f"{domain_name}{tld}"
-    result = {'status': 'Unknown'} # Initialize result dictionary
+    domain_match = _RE_DOMAIN.search(text)
+    if domain_match is None:
+        if _AVAIL_RE.search(text):
+            return SimpleNamespace(domain_name=None)
+        return None
 
-    # Skip TLDs known to cause problems with the current library to avoid long waits/errors
-    if tld.lower() in KNOWN_PROBLEMATIC_TLDS:
-        print(f"[*] Skipping {full_domain} (known problematic TLD with this library)")
-        result['status'] = 'Skipped'
-        return result
+    registrar = _RE_REGISTRAR.search(text)
+    created = _RE_CREATED.search(text)
+    updated = _RE_UPDATED.search(text)
+    return SimpleNamespace(
+        domain_name=domain_match.group(1).strip(),
+        registrar=registrar.group(1).strip() if registrar else None,
+        creation_date=_parse_whois_date(created.group(1).strip()) if created else None,
+        updated_date=_parse_whois_date(updated.group(1).strip()) if updated else None,
+    )
 
+@contextlib.contextmanager
+def _throttled(server):
+    """Holds server's lock for one query, first waiting out the rest of SERVER_QUERY_INTERVAL since its last query."""
+    with _server_locks[server]:
+        wait = _last_query.get(server, 0) + SERVER_QUERY_INTERVAL - time.monotonic()
+        if wait > 0:
+            time.sleep(wait)
+        try:
+            yield
+        finally:
+            _last_query[server] = time.monotonic()
+
+def whois_server(tld_lc):
+    """Returns the WHOIS server for a lowercase TLD (e.g. '.com'), or None if none is known.
+
+    Uses TLD_SERVER first, then _TLD_SERVER_CACHE, and otherwise asks whois.iana.org
+    for the TLD's referral server and caches the answer. For multi-label suffixes
+    like '.co.uk' the last label's server is used.
+    """
+    if tld_lc in TLD_SERVER:
+        return TLD_SERVER[tld_lc]
+    if tld_lc in _TLD_SERVER_CACHE:
+        return _TLD_SERVER_CACHE[tld_lc]
+    with _tld_server_cache_lock:
+        # Another worker may have bootstrapped this TLD while we waited for the lock
+        if tld_lc in _TLD_SERVER_CACHE:
+            return _TLD_SERVER_CACHE[tld_lc]
+        try:
+            with _throttled(IANA_WHOIS_SERVER):
+                text = raw_whois(IANA_WHOIS_SERVER, tld_lc.rsplit('.', 1)[-1])
+        except (OSError, UnicodeError):
+            # Don't cache network failures or unencodable TLDs; python-whois will pick a server this time
+            return None
+        match = _RE_IANA_REFERRAL.search(text)
+        _TLD_SERVER_CACHE[tld_lc] = match.group(1) if match else None
+        _save_tld_server_cache()
+        return _TLD_SERVER_CACHE[tld_lc]
+
+def parse_whois_reply(full_domain, tld_lc, text):
+    """Parses a raw WHOIS reply into an object with python-whois' result attributes.
+
+    Replies for FAST_WHOIS_TLDS are parsed with fast_whois; anything else (or an
+    unrecognized format) is handed to python-whois' parser.
+
+    Raises:
+        whois.exceptions.PywhoisError: If python-whois rejects the reply (often meaning the domain is available).
+    """
+    if tld_lc in FAST_WHOIS_TLDS:
+        w = fast_whois(text)
+        if w is not None:
+            return w
+    import whois
+    return whois.parser.WhoisEntry.load(full_domain, text)
+
+def whois_lookup(full_domain, tld_lc):
+    """Performs a WHOIS lookup with a short timeout, retrying network failures.
+
+    tld_lc is the lowercase TLD, including the dot. TLDs in TLD_SERVER are
+    queried directly with raw_whois, those with a server bootstrapped from IANA
+    (see whois_server) with nic_whois; either reply is parsed with
+    parse_whois_reply. TLDs with no known server go through python-whois.
+    Queries to the same server are spaced SERVER_QUERY_INTERVAL apart.
+    Timeouts, connection errors and rate-limit replies are retried with
+    exponential back-off (0.5s, then 1s).
+
+    Raises:
+        socket.timeout, ConnectionError: If every attempt fails.
+    """
+    import whois
+    server = whois_server(tld_lc)
+    # python-whois picks its own server per TLD, so fall back to the TLD as the throttle key
+    throttle_key = server or tld_lc
+    for attempt in range(WHOIS_RETRIES):
+        try:
+            with _throttled(throttle_key):
+                if server is None:
+                    # Socket errors are raised instead of being silently turned into an empty response
+                    return whois.whois(full_domain, timeout=WHOIS_TIMEOUT, ignore_socket_errors=False)
+                if tld_lc in TLD_SERVER:
+                    text = raw_whois(server, full_domain)
+                else:
+                    text = nic_whois(server, full_domain)
+            if _RATE_LIMIT_RE.search(text):
+                raise ConnectionError(f"Rate limited by {server}")
+            return parse_whois_reply(full_domain, tld_lc, text)
+        except (socket.timeout, ConnectionError):
+            if attempt == WHOIS_RETRIES - 1:
+                raise
+            time.sleep(0.5 * 2 ** attempt)
+
+def is_unregistered_in_dns(full_domain):
+    """Checks whether DNS says the domain doesn't exist (NXDOMAIN for an NS query).
+
+    A registered domain almost always has NS records at its TLD's servers, and this
+    query takes milliseconds compared to seconds for WHOIS. Any other outcome
+    (answers, no NS records, timeouts) returns False so WHOIS gets the final say.
+    """
+    import dns.exception
+    import dns.resolver
+    try:
+        dns.resolver.resolve(full_domain, 'NS', lifetime=DNS_TIMEOUT)
+    except dns.resolver.NXDOMAIN:
+        return True
+    except dns.exception.DNSException:
+        pass
+    return False
+
+def record_lookup(result, lookup):
+    """Runs a WHOIS lookup and records its outcome in a check_domain result dictionary.
+
+    Args:
+        result (dict): The result dictionary to update.
+        lookup (callable): Returns a python-whois style result object, or None if the
+            domain is already known to be unregistered.
+    """
+    import whois.exceptions
     try:
-        print(f"[*] Checking {full_domain}...")
-        # Perform the WHOIS lookup
-        w = whois.whois(full_domain)
+        w = lookup()
 
         # --- Determine Status based on WHOIS response --- 
         # The python-whois library's behavior varies. 
         # Presence of 'domain_name' usually indicates registration.
         # Absence or specific exceptions often indicate availability.
-        if w.domain_name:
+        if w is not None and w.domain_name:
             # Domain appears registered, extract details if possible
-            result['status'] = 'Registered'
-            result['registrar'] = w.registrar if hasattr(w, 'registrar') and w.registrar else 'N/A'
+            creation_date = getattr(w, 'creation_date', None)
+            updated_date = getattr(w, 'updated_date', None)
             # Use helper to format dates, handling missing attributes and potential lists
-            result['creation_date'] = format_date(w.creation_date) if hasattr(w, 'creation_date') else 'N/A'
-            result['updated_date'] = format_date(w.updated_date) if hasattr(w, 'updated_date') else 'N/A'
+            result.update({
+                'status': 'Registered',
+                'registrar': getattr(w, 'registrar', None) or 'N/A',
+                'creation_date': format_date(creation_date) if creation_date else 'N/A',
+                'updated_date': format_date(updated_date) if updated_date else 'N/A',
+            })
             # Note: Registrant name/org is often redacted due to privacy policies.
         else:
-            # No domain_name found, likely available (though not guaranteed)
+            # No domain_name found (or DNS says it doesn't exist), likely available (though not guaranteed)
             result['status'] = 'Available'
 
-    except whois.parser.PywhoisError as e:
+    except whois.exceptions.PywhoisError as e:
         # Handle specific errors from the WHOIS library that indicate availability
-        error_str = str(e).lower()
-        if "no match for" in error_str or "no whois server is known for" in error_str or "domain not found" in error_str:
+        if _AVAIL_RE.search(str(e)):
             result['status'] = 'Available'
         else:
             # Other WHOIS parsing errors
-            print(f"[!] WHOIS Error checking {full_domain}: {e}")
             result['status'] = 'Error'
             result['message'] = str(e)
     except Exception as e:
         # Catch other potential exceptions (e.g., network issues, timeouts, unexpected data)
-        print(f"[!] Unexpected error checking {full_domain}: {e}")
         result['status'] = 'Error'
         result['message'] = str(e)
 
+def _report_redis_error(e):
+    """Warns on stderr the first time the Redis cache fails; lookups carry on without it."""
+    global _redis_error_reported
+    with _redis_error_lock:
+        if _redis_error_reported:
+            return
+        _redis_error_reported = True
+    print(f"[!] Redis cache unavailable, continuing without it: {e}", file=sys.stderr)
+
+def get_cached_result(full_domain):
+    """Returns the cached result for full_domain, or None if it isn't cached (or caching is off)."""
+    if _redis is None:
+        return None
+    try:
+        cached = _redis.get(f"whois:{full_domain}")
+    except redis.RedisError as e:
+        _report_redis_error(e)
+        return None
+    return json.loads(cached) if cached else None
+
+def cache_result(full_domain, result):
+    """Caches a result for CACHE_TTL seconds if caching is enabled."""
+    # Only cache definitive answers so transient errors aren't sticky
+    if _redis is not None and result['status'] in ('Registered', 'Available'):
+        try:
+            _redis.setex(f"whois:{full_domain}", CACHE_TTL, json.dumps(result))
+        except redis.RedisError as e:
+            _report_redis_error(e)
+
+def _quick_result(full_domain, tld_lc):
+    """Returns full_domain's result if it can be had without a WHOIS lookup, else None.
+
+    That's a cached result, or 'Available' (which is then cached) when the DNS probe
+    says the domain doesn't exist. Used by the backends that batch their WHOIS queries.
+    """
+    cached = get_cached_result(full_domain)
+    if cached is not None:
+        return cached
+    if is_unregistered_in_dns(full_domain):
+        result = {'status': 'Available', 'registrar': None, 'creation_date': None, 'updated_date': None, 'message': None}
+        cache_result(full_domain, result)
+        return result
+    return None
+
+def check_domain(domain_name, tld):
+    """Checks the availability and WHOIS details of a single domain.
+
+    Args:
+        domain_name (str): The base domain name (e.g., 'example').
+        tld (str): The top-level domain, including the dot (e.g., '.com').
+
+    Returns:
+        dict: A dictionary containing 'status' ('Registered', 'Available', 'Error', 'Skipped')
+              plus 'registrar', 'creation_date', 'updated_date' and 'message' (for errors),
+              which are None when not applicable.
+    """
+    full_domain = f"{domain_name}{tld}"
+    tld_lc = tld.lower()
+    # Initialize result dictionary with every key up front so filling it in never resizes it
+    result = {'status': 'Unknown', 'registrar': None, 'creation_date': None, 'updated_date': None, 'message': None}
+
+    # Skip TLDs known to cause problems with the current library to avoid long waits/errors
+    if tld_lc in KNOWN_PROBLEMATIC_TLDS:
+        result['status'] = 'Skipped'
+        return result
+
+    # Serve recently checked domains from the cache without querying WHOIS again
+    cached = get_cached_result(full_domain)
+    if cached is not None:
+        return cached
+
+    def lookup():
+        # Quick DNS probe first: a non-existent domain doesn't need a WHOIS lookup at all
+        if is_unregistered_in_dns(full_domain):
+            return None
+        # Perform the WHOIS lookup (also provides registrar/date details)
+        return whois_lookup(full_domain, tld_lc)
+
+    record_lookup(result, lookup)
+
+    cache_result(full_domain, result)
     return result
 
-def main():
+def format_result(full_domain, result_data):
+    """Builds the display text for one domain's result.
+
+    Returns:
+        str: The lines for this domain, newline-terminated, so they can be written in one call.
+    """
+    if result_data['status'] == 'Skipped':
+        lines = [f"[*] Skipping {full_domain} (known problematic TLD with this library)"]
+    else:
+        lines = [f"[*] Checking {full_domain}..."]
+    lines.append(f"  -> Status: {result_data['status']}")
+    if result_data['status'] == 'Registered':
+        # Include details if registered
+        lines.append(f"     Registrar: {result_data.get('registrar') or 'N/A'}")
+        lines.append(f"     Created:   {result_data.get('creation_date') or 'N/A'}")
+        lines.append(f"     Updated:   {result_data.get('updated_date') or 'N/A'}")
+    elif result_data['status'] == 'Error':
+        # Include error message if applicable
+        lines.append(f"     Error Msg: {result_data.get('message') or 'Unknown error'}")
+    # Separator between checks
+    lines.append("---")
+    return "\n".join(lines) + "\n"
+
+def check_domains_bulk(base_name, tlds_list):
+    """Checks availability of several domains with a single bulk API request.
+
+    One HTTPS request replaces a separate WHOIS connection per TLD. The availability
+    API only reports whether a domain is taken, so registration details are 'N/A'.
+
+    Args:
+        base_name (str): The base domain name (e.g., 'example').
+        tlds_list (list): TLDs to check, including the dot (e.g., ['.com', '.net']).
+
+    Returns:
+        dict: Result dictionaries (same shape as check_domain) keyed by full domain.
+              Domains the API gives no availability for are left out.
+
+    Raises:
+        OSError: If the API request fails (including timeouts, resets and HTTP errors).
+        ValueError: If the API response isn't valid JSON or has no per-domain results,
+            or a domain has no ASCII (punycode) form.
+    """
+    import http.client
+    import urllib.request
+    # Full domain -> the ASCII form the API expects and answers with
+    domains = {full_domain: full_domain.encode('idna').decode('ascii').lower()
+               for full_domain in (f"{base_name}{tld}" for tld in tlds_list)}
+    payload = {'apiKey': os.environ[BULK_API_KEY_ENV], 'domains': list(domains.values())}
+    request = urllib.request.Request(
+        BULK_API_URL,
+        data=json.dumps(payload).encode(),
+        headers={'Content-Type': 'application/json'},
+        method='POST',
+    )
+    try:
+        with urllib.request.urlopen(request, timeout=30) as response:
+            data = json.load(response)
+    except http.client.HTTPException as e:
+        # e.g. the connection dropping mid-response; surface it like other network errors
+        raise ConnectionError(f"Bulk API request failed: {e!r}") from e
+
+    # An error reply (bad key, quota, ...) has no per-domain entries
+    if not isinstance(data, dict) or not isinstance(data.get('domainsInfo'), list):
+        raise ValueError(f"Unexpected bulk API response: {str(data)[:200]}")
+
+    # Index the per-domain entries returned by the API
+    availability = {}
+    for info in data['domainsInfo']:
+        availability[info.get('domainName', '').lower()] = info.get('domainAvailability')
+
+    results = {}
+    for full_domain, ascii_domain in domains.items():
+        status = availability.get(ascii_domain)
+        result = {'status': 'Unknown', 'registrar': None, 'creation_date': None, 'updated_date': None, 'message': None}
+        if status == 'AVAILABLE':
+            result['status'] = 'Available'
+        elif status == 'UNAVAILABLE':
+            result.update({'status': 'Registered', 'registrar': 'N/A',
+                           'creation_date': 'N/A', 'updated_date': 'N/A'})
+        else:
+            continue
+        results[full_domain] = result
+    return results
+
+def check_all_bulk(domain_name, tlds_list, concurrency=MAX_CONCURRENT_LOOKUPS):
+    """Checks every TLD in tlds_list, sending the domains that need a lookup to the bulk API.
+
+    Like check_domain, problematic TLDs are skipped and each domain is first looked
+    up in the result cache and probed with DNS. Domains the API gives no answer
+    for are looked up with WHOIS (see check_all).
+
+    Returns:
+        list: One result dictionary per TLD, in the same order as tlds_list.
+
+    Raises:
+        OSError, ValueError: If the bulk API request fails (see check_domains_bulk).
+    """
+    results = {}
+    for tld in tlds_list:
+        tld_lc = tld.lower()
+        if tld_lc in KNOWN_PROBLEMATIC_TLDS:
+            results[tld] = check_domain(domain_name, tld)  # Reports it as skipped
+            continue
+        quick = _quick_result(f"{domain_name}{tld}", tld_lc)
+        if quick is not None:
+            results[tld] = quick
+
+    pending = [tld for tld in tlds_list if tld not in results]
+    if pending:
+        bulk_results = check_domains_bulk(domain_name, pending)
+        for tld in pending:
+            full_domain = f"{domain_name}{tld}"
+            if full_domain in bulk_results:
+                results[tld] = bulk_results[full_domain]
+                cache_result(full_domain, results[tld])
+
+    missing = [tld for tld in tlds_list if tld not in results]
+    if missing:
+        results.update(zip(missing, check_all(domain_name, missing, concurrency)))
+    return [results[tld] for tld in tlds_list]
+
+async def check_domain_async(domain_name, tld, sem, executor):
+    """Runs check_domain in a worker thread so several TLDs can be checked at once.
+
+    Args:
+        domain_name (str): The base domain name (e.g., 'example').
+        tld (str): The top-level domain, including the dot (e.g., '.com').
+        sem (asyncio.Semaphore): Limits how many lookups run concurrently.
+        executor (ThreadPoolExecutor): Worker threads for the blocking lookups.
+
+    Returns:
+        dict: The same result dictionary returned by check_domain.
+    """
+    import asyncio
+    loop = asyncio.get_running_loop()
+    async with sem:
+        return await loop.run_in_executor(executor, check_domain, domain_name, tld)
+
+async def check_all_async(domain_name, tlds_list, concurrency=MAX_CONCURRENT_LOOKUPS):
+    """Checks every TLD in tlds_list concurrently.
+
+    Each TLD is usually served by a different registry WHOIS server, so the
+    lookups are dispatched together instead of one after another.
+
+    Returns:
+        list: One result dictionary per TLD, in the same order as tlds_list.
+    """
+    import asyncio
+    from concurrent.futures import ThreadPoolExecutor
+    sem = asyncio.Semaphore(concurrency)
+    with ThreadPoolExecutor(max_workers=concurrency) as executor:
+        tasks = [check_domain_async(domain_name, tld, sem, executor) for tld in tlds_list]
+        results = await asyncio.gather(*tasks, return_exceptions=True)
+    # check_domain handles its own errors, but make sure nothing escaping it hides the other results
+    return [{'status': 'Error', 'registrar': None, 'creation_date': None, 'updated_date': None, 'message': str(r)}
+            if isinstance(r, Exception) else r
+            for r in results]
+
+async def check_batch_async(entries, out, concurrency=MAX_CONCURRENT_LOOKUPS):
+    """Checks many domains concurrently, streaming results as JSON lines.
+
+    Each result is written to out as soon as its lookup finishes, so the output
+    order follows completion rather than input order.
+
+    Args:
+        entries (list): (base_name, tld) pairs to check.
+        out (file): Writable text stream for the JSON lines.
+        concurrency (int): Maximum number of lookups in flight.
+    """
+    import asyncio
+    from concurrent.futures import ThreadPoolExecutor
+    sem = asyncio.Semaphore(concurrency)
+
+    async def check(base_name, tld, executor):
+        try:
+            result = await check_domain_async(base_name, tld, sem, executor)
+        except Exception as e:
+            # check_domain handles its own errors; don't let anything else stop the batch
+            result = {'status': 'Error', 'registrar': None, 'creation_date': None, 'updated_date': None,
+                      'message': str(e)}
+        return f"{base_name}{tld}", result
+
+    with ThreadPoolExecutor(max_workers=concurrency) as executor:
+        for next_result in asyncio.as_completed([check(base_name, tld, executor) for base_name, tld in entries]):
+            full_domain, result = await next_result
+            out.write(json.dumps({'domain': full_domain, **result}) + "\n")
+            out.flush()
+
+def _check_domain_safe(domain_name, tld):
+    """Runs check_domain, turning anything escaping it into an 'Error' result (module-level so it can be pickled)."""
+    try:
+        return check_domain(domain_name, tld)
+    except Exception as e:
+        return {'status': 'Error', 'registrar': None, 'creation_date': None, 'updated_date': None, 'message': str(e)}
+
+def check_all_multiprocess(domain_name, tlds_list, concurrency=MAX_CONCURRENT_LOOKUPS):
+    """Checks every TLD in tlds_list in a pool of worker processes.
+
+    Alternative to check_all_async that also parallelizes python-whois' response
+    parsing across CPU cores. Each process keeps its own per-server query
+    spacing, so same-server TLDs in different workers aren't spaced apart.
+
+    Returns:
+        list: One result dictionary per TLD, in the same order as tlds_list.
+    """
+    import multiprocessing
+    processes = max(1, min(len(tlds_list), concurrency))
+    with multiprocessing.Pool(processes=processes) as pool:
+        return pool.starmap(_check_domain_safe, [(domain_name, tld) for tld in tlds_list])
+
+def bulk_whois(domain_name, tld_to_server):
+    """Queries several WHOIS servers at once from a single thread using non-blocking sockets.
+
+    All connections are driven by one selectors event loop (epoll/kqueue), so the
+    total wait is roughly that of the slowest server. There are no retries:
+    servers that stay silent for WHOIS_TIMEOUT seconds are reported as errors.
+
+    Args:
+        domain_name (str): The base domain name (e.g., 'example').
+        tld_to_server (dict): Maps each lowercase TLD (e.g., '.com') to its WHOIS server.
+
+    Returns:
+        dict: check_domain style result dictionaries keyed by TLD.
+    """
+    import selectors
+    sel = selectors.DefaultSelector()
+    replies = {}  # TLD -> bytearray of the reply received so far
+    failures = {}  # TLD -> error message
+    remaining_addrs = {}  # TLD -> addresses not tried yet
+    queries = {}  # TLD -> query bytes, with IDNs in their ASCII (punycode) form
+
+    def connect_next(tld):
+        """Starts a non-blocking connection to the TLD's next untried address."""
+        server = tld_to_server[tld]
+        while remaining_addrs[tld]:
+            family, sockaddr = remaining_addrs[tld].pop(0)
+            sock = socket.socket(family, socket.SOCK_STREAM)
+            sock.setblocking(False)
+            err = sock.connect_ex(sockaddr)
+            if err in (0, errno.EINPROGRESS, errno.EWOULDBLOCK):
+                replies[tld] = bytearray()
+                sel.register(sock, selectors.EVENT_WRITE, (tld, queries[tld]))
+                return
+            sock.close()
+            failures[tld] = os.strerror(err)
+        # Every address failed; forget them in case the server has moved
+        _server_addrs.pop(server, None)
+
+    for tld, server in tld_to_server.items():
+        try:
+            queries[tld] = f"{domain_name}{tld}".encode('idna') + b"\r\n"
+            remaining_addrs[tld] = list(_resolve_server(server))
+        except (OSError, UnicodeError) as e:
+            failures[tld] = str(e)
+            continue
+        connect_next(tld)
+
+    while sel.get_map():
+        events = sel.select(timeout=WHOIS_TIMEOUT)
+        if not events:
+            # Nothing happened within the timeout; give up on the remaining servers
+            for key in list(sel.get_map().values()):
+                failures[key.data[0]] = 'timed out'
+                sel.unregister(key.fileobj)
+                key.fileobj.close()
+            break
+        for key, mask in events:
+            sock = key.fileobj
+            tld, pending = key.data
+            try:
+                if mask & selectors.EVENT_WRITE:
+                    err = sock.getsockopt(socket.SOL_SOCKET, socket.SO_ERROR)
+                    if err:
+                        # This address is unreachable; move on to the server's next one
+                        failures[tld] = os.strerror(err)
+                        sel.unregister(sock)
+                        sock.close()
+                        connect_next(tld)
+                        continue
+                    # Connected; send the rest of the query
+                    pending = pending[sock.send(pending):]
+                    if pending:
+                        sel.modify(sock, selectors.EVENT_WRITE, (tld, pending))
+                    else:
+                        sel.modify(sock, selectors.EVENT_READ, (tld, b''))
+                    continue
+                chunk = sock.recv(4096)
+                if chunk:
+                    replies[tld] += chunk
+                    continue
+                # Reply complete (server closed the connection)
+                failures.pop(tld, None)
+            except OSError as e:
+                failures[tld] = str(e)
+            sel.unregister(sock)
+            sock.close()
+    sel.close()
+
+    results = {}
+    for tld in tld_to_server:
+        full_domain = f"{domain_name}{tld}"
+        result = {'status': 'Unknown', 'registrar': None, 'creation_date': None, 'updated_date': None, 'message': None}
+        if tld in failures:
+            result['status'] = 'Error'
+            result['message'] = failures[tld]
+        else:
+            text = replies[tld].decode('utf-8', errors='replace')
+            if not text.strip():
+                # Same as raw_whois: no reply at all is a failure, not an availability answer
+                result['status'] = 'Error'
+                result['message'] = f"Empty reply from {tld_to_server[tld]}"
+            elif _RATE_LIMIT_RE.search(text):
+                result['status'] = 'Error'
+                result['message'] = f"Rate limited by {tld_to_server[tld]}"
+            else:
+                record_lookup(result, lambda: parse_whois_reply(full_domain, tld, text))
+        results[tld] = result
+    return results
+
+def check_all_selectors(domain_name, tlds_list, concurrency=MAX_CONCURRENT_LOOKUPS):
+    """Checks every TLD in tlds_list from a single thread using bulk_whois.
+
+    Like check_domain, each domain is first looked up in the result cache and
+    probed with DNS. TLDs in TLD_SERVER that still need a lookup are
+    queried in rounds of at most `concurrency` connections that contain each server
+    at most once; a server is queried again only after SERVER_QUERY_INTERVAL.
+    Other TLDs (whose servers may need the query syntax nic_whois adds) go
+    through check_domain one at a time.
+
+    Returns:
+        list: One result dictionary per TLD, in the same order as tlds_list.
+    """
+    results = {}
+    rounds = []  # Each round maps TLD -> server, with no server repeated and at most `concurrency` entries
+    for tld in tlds_list:
+        tld_lc = tld.lower()
+        server = None if tld_lc in KNOWN_PROBLEMATIC_TLDS else TLD_SERVER.get(tld_lc)
+        if server is None:
+            # check_domain reports skipped TLDs and looks up the rest with whois_lookup
+            results[tld] = check_domain(domain_name, tld)
+            continue
+        quick = _quick_result(f"{domain_name}{tld}", tld_lc)
+        if quick is not None:
+            results[tld] = quick
+            continue
+        for tld_to_server in rounds:
+            if server not in tld_to_server.values() and len(tld_to_server) < concurrency:
+                tld_to_server[tld_lc] = server
+                break
+        else:
+            rounds.append({tld_lc: server})
+
+    for tld_to_server in rounds:
+        # Only wait if a server in this round was queried less than SERVER_QUERY_INTERVAL ago
+        wait = max(_last_query.get(server, 0) for server in tld_to_server.values()) \
+            + SERVER_QUERY_INTERVAL - time.monotonic()
+        if wait > 0:
+            time.sleep(wait)
+        round_results = bulk_whois(domain_name, tld_to_server)
+        for server in tld_to_server.values():
+            _last_query[server] = time.monotonic()
+        for tld in tlds_list:
+            if tld.lower() in round_results:
+                results[tld] = round_results[tld.lower()]
+                cache_result(f"{domain_name}{tld}", results[tld])
+    return [results[tld] for tld in tlds_list]
+
+def check_all(domain_name, tlds_list, concurrency=MAX_CONCURRENT_LOOKUPS):
+    """Checks every TLD in tlds_list with WHOIS, using the backend selected by BACKEND.
+
+    Returns:
+        list: One result dictionary per TLD, in the same order as tlds_list.
+    """
+    if BACKEND == 'process':
+        return check_all_multiprocess(domain_name, tlds_list, concurrency)
+    if BACKEND == 'selectors':
+        return check_all_selectors(domain_name, tlds_list, concurrency)
+    import asyncio
+    return asyncio.run(check_all_async(domain_name, tlds_list, concurrency))
+
+def parse_tlds(tlds_input):
+    """Turns a space-separated TLD string (e.g. '.com org') into a list of lowercase, dot-prefixed TLDs."""
+    return [tld if tld.startswith('.') else '.' + tld for tld in tlds_input.lower().split()]
+
+def parse_args(argv=None):
+    parser = argparse.ArgumentParser(description="Check domain name availability using WHOIS lookups.")
+    parser.add_argument('--file', type=argparse.FileType('r'), help="file with one base name (or full domain) per line; "
+                                       "checks them all without prompting and prints one JSON result per line")
+    parser.add_argument('--tlds', help="TLDs to check, e.g. '.com .org .net' (default: .com .net .org)")
+    parser.add_argument('--concurrency', type=int, default=MAX_CONCURRENT_LOOKUPS,
+                        help=f"maximum number of lookups in flight (default: {MAX_CONCURRENT_LOOKUPS})")
+    parser.add_argument('--output', help="write --file results to this file instead of stdout")
+    args = parser.parse_args(argv)
+    if args.concurrency < 1:
+        parser.error("--concurrency must be at least 1")
+    if args.output and not args.file:
+        parser.error("--output can only be used with --file")
+    return args
+
+def run_batch(args):
+    """Checks every name in args.file and writes the results as JSON lines."""
+    import asyncio
+    tlds = parse_tlds(args.tlds) if args.tlds else DEFAULT_TLDS
+    # Dict keys drop duplicate domains while keeping the file's order
+    entries = {}
+    with args.file as f:
+        for line in f:
+            name = line.strip().lower()
+            # Skip blank lines and comments
+            if not name or name.startswith('#'):
+                continue
+            base_name, _, tld = name.rpartition('.')
+            if base_name and tld:
+                # A full domain: only check that TLD, as in interactive mode
+                entries[(base_name, '.' + tld)] = None
+            else:
+                entries.update(dict.fromkeys((name, t) for t in tlds))
+
+    if args.output:
+        with open(args.output, 'w') as out:
+            asyncio.run(check_batch_async(list(entries), out, args.concurrency))
+    else:
+        asyncio.run(check_batch_async(list(entries), sys.stdout, args.concurrency))
+
+def main(argv=None):
+    args = parse_args(argv)
+    # Batch mode: no prompts, JSON lines output
+    if args.file:
+        run_batch(args)
+        return
+
     print("Domain Availability Checker")
     print("---------------------------")
 
     # --- Input Stage --- 
     # Get the domain/base name from the user
     name_input = input("Enter the full domain (e.g., google.com) OR base name (e.g., google) to check: ").strip().lower()
-    # Delay is now fixed to 1 second to avoid prompt and be polite to WHOIS servers
-    delay = 1.0
 
     # Initialize variables
     base_name = name_input
     original_tld = None
-    tlds_to_check = set() # Using a set prevents duplicate TLD checks
+    tlds_to_check = {} # Dict keys prevent duplicate TLD checks while keeping the entered order
     process_further_tlds = True # Flag to determine if we need to ask for/use default TLDs
 
     # Basic input validation
@@ -114,7 +956,7 @@ def main():
             base_name = parts[0]
             original_tld = '.' + parts[1]
             # If a full domain was provided, only check this specific TLD by default
-            tlds_to_check.add(original_tld)
+            tlds_to_check[original_tld] = None
             process_further_tlds = False # Skip asking for additional TLDs
         else:
              # Handle cases like '.' or 'domain.' - treat as base name
@@ -127,63 +969,55 @@ def main():
         # process_further_tlds remains True
 
     # Ask for TLDs only if a base name was given OR the input format was ambiguous
+    # (TLDs passed with --tlds are used without asking)
     if process_further_tlds:
-        additional_tlds_input = input("Enter TLDs to check (e.g., .com .org .net - leave blank for defaults): ").strip()
+        if args.tlds:
+            additional_tlds_input = args.tlds
+        else:
+            additional_tlds_input = input("Enter TLDs to check (e.g., .com .org .net - leave blank for defaults): ").strip()
         if additional_tlds_input:
-            # Process the entered TLDs: ensure they start with '.', convert to lowercase, add to set
-            additional_tlds = {tld.strip() if tld.strip().startswith('.') else '.' + tld.strip().lower() 
-                               for tld in additional_tlds_input.split()
-                               if tld.strip()} # Filter out empty strings from multiple spaces
-            tlds_to_check.update(additional_tlds)
+            # Process the entered TLDs: ensure they start with '.', convert to lowercase, add in order
+            tlds_to_check.update(dict.fromkeys(parse_tlds(additional_tlds_input)))
         else:
             # No additional TLDs provided for a base name, use default list
-            tlds_to_check = {'.com', '.net', '.org'} # Default TLDs
+            tlds_to_check = dict.fromkeys(DEFAULT_TLDS) # Default TLDs
             print("No TLDs specified, using defaults: .com, .net, .org")
 
     # --- Execution Stage --- 
-    # Convert the set of TLDs to a sorted list for consistent checking order
-    tlds_list = sorted(list(tlds_to_check))
+    # Convert the TLDs to a list, in the order they were entered
+    # (skipping empty/invalid TLD entries)
+    tlds_list = [tld for tld in tlds_to_check if tld]
     
     # Print summary of what will be checked
     print(f"\nChecking base name: {base_name}")
-    print(f"Against TLDs: {', '.join(tlds_list)}")
-    print(f"Delay: {delay}s\n")
+    print(f"Against TLDs: {', '.join(tlds_list)}\n")
+
+    results_list = None
+    # Use a single bulk API request for multiple TLDs when an API key is configured
+    if len(tlds_list) > 1 and os.environ.get(BULK_API_KEY_ENV):
+        try:
+            results_list = check_all_bulk(base_name, tlds_list, args.concurrency)
+        except (OSError, ValueError) as e:
+            print(f"[!] Bulk API request failed, falling back to WHOIS: {e}")
+
+    if results_list is None:
+        # Run all lookups concurrently; results come back in the same order as tlds_list
+        results_list = check_all(base_name, tlds_list, args.concurrency)
 
     # Dictionary to store results (optional, mainly for potential future summary)
     results = {}
+    # Collect all output first and write it in one go instead of one print() per line
+    output = io.StringIO()
     
-    # Loop through each TLD to check
-    for i, tld in enumerate(tlds_list):
-        # Basic check to skip empty/invalid TLD entries
-        if not tld:
-            print(f"Skipping invalid TLD entry.")
-            continue
-            
+    # Loop through each TLD's result
+    for tld, result_data in zip(tlds_list, results_list):
         # Construct the full domain name for this iteration
         full_domain_to_check = f"{base_name}{tld}"
-        
-        # Call the function to perform the check
-        result_data = check_domain(base_name, tld)
         results[full_domain_to_check] = result_data
-        
-        # --- Print Intermediate Results --- 
-        print(f"  -> Status: {result_data['status']}")
-        if result_data['status'] == 'Registered':
-            # Print details if registered
-            print(f"     Registrar: {result_data.get('registrar', 'N/A')}")
-            print(f"     Created:   {result_data.get('creation_date', 'N/A')}")
-            print(f"     Updated:   {result_data.get('updated_date', 'N/A')}")
-        elif result_data['status'] == 'Error':
-            # Print error message if applicable
-             print(f"     Error Msg: {result_data.get('message', 'Unknown error')}")
-
-        # Apply delay between checks unless it's the last TLD or was skipped
-        if result_data['status'] != 'Skipped' and i < len(tlds_list) - 1:
-            print(f"[*] Waiting {delay}s...")
-            time.sleep(delay)
-            
-        # Print separator between checks
-        print("---")
+        output.write(format_result(full_domain_to_check, result_data))
+
+    sys.stdout.write(output.getvalue())
+    sys.stdout.flush()
 
     # Final note to the user
     print("\nNote: WHOIS data accuracy varies. 'Available' might still be premium/reserved.")
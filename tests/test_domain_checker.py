@@ -0,0 +1,253 @@
+import datetime
+import io
+import json
+import os
+import socket
+import sys
+import tempfile
+import threading
+import unittest
+from types import SimpleNamespace
+from unittest import mock
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), os.pardir))
+
+import domain_checker
+
+
+def fake_socket(reply):
+    """A socket stand-in for _connect that records what was sent and then returns reply."""
+    sock = mock.MagicMock()
+    sock.__enter__.return_value = sock
+    sock.recv.side_effect = [reply, b''] if reply else [b'']
+    return sock
+
+
+@mock.patch.object(domain_checker, 'SERVER_QUERY_INTERVAL', 0)
+@mock.patch.object(domain_checker, 'is_unregistered_in_dns', lambda full_domain: False)
+class CheckDomainErrorTests(unittest.TestCase):
+    """Lookup failures must become results, not exceptions escaping check_domain."""
+
+    def test_not_found_reply_is_available(self):
+        with mock.patch.object(domain_checker, 'raw_whois', return_value='    No match for "example-free.uk".\r\n'):
+            result = domain_checker.check_domain('example-free', '.uk')
+        self.assertEqual(result['status'], 'Available')
+
+    def test_network_error_is_reported(self):
+        with mock.patch.object(domain_checker, 'raw_whois', side_effect=ConnectionError('connection reset')), \
+                mock.patch.object(domain_checker.time, 'sleep'):
+            result = domain_checker.check_domain('example', '.uk')
+        self.assertEqual(result['status'], 'Error')
+        self.assertEqual(result['message'], 'connection reset')
+
+    def test_empty_reply_is_retried_and_reported(self):
+        # Servers that rate-limit by closing the connection must not look like 'not registered'
+        with mock.patch.object(domain_checker, '_connect', side_effect=lambda server: fake_socket(b'')) as connect, \
+                mock.patch.object(domain_checker.time, 'sleep'):
+            result = domain_checker.check_domain('google', '.com')
+        self.assertEqual(connect.call_count, domain_checker.WHOIS_RETRIES)
+        self.assertEqual(result['status'], 'Error')
+        self.assertEqual(result['message'], 'Empty reply from whois.verisign-grs.com')
+
+
+class RawWhoisTests(unittest.TestCase):
+
+    def test_idn_is_sent_as_punycode(self):
+        sock = fake_socket(b'Domain Name: XN--BCHER-KVA.COM\r\n')
+        with mock.patch.object(domain_checker, '_connect', return_value=sock):
+            domain_checker.raw_whois('whois.verisign-grs.com', 'b\u00fccher.com')
+        sock.sendall.assert_called_once_with(b'xn--bcher-kva.com\r\n')
+
+
+@mock.patch.object(domain_checker, 'SERVER_QUERY_INTERVAL', 0)
+class NicWhoisTests(unittest.TestCase):
+
+    def test_jprs_query_asks_for_english(self):
+        # Without the '/e' suffix JPRS replies in Japanese and python-whois' .jp parser finds nothing
+        sock = fake_socket(b'[Domain Name]                   NINTENDO.CO.JP\n')
+        with mock.patch.object(domain_checker, 'whois_server', return_value='whois.jprs.jp'), \
+                mock.patch('whois.NICClient.get_socket', return_value=sock):
+            w = domain_checker.whois_lookup('nintendo.co.jp', '.co.jp')
+        sock.send.assert_called_once_with(b'nintendo.co.jp/e\r\n')
+        self.assertEqual(w.domain_name, 'NINTENDO.CO.JP')
+
+
+class SelectorsBackendTests(unittest.TestCase):
+
+    def test_dns_probe_skips_whois(self):
+        with mock.patch.object(domain_checker, 'is_unregistered_in_dns', return_value=True), \
+                mock.patch.object(domain_checker, 'bulk_whois') as bulk_whois:
+            results = domain_checker.check_all_selectors('example-free', ['.com', '.org'])
+        bulk_whois.assert_not_called()
+        self.assertEqual([r['status'] for r in results], ['Available', 'Available'])
+
+    def test_empty_reply_is_an_error(self):
+        server = socket.create_server(('127.0.0.1', 0))
+        self.addCleanup(server.close)
+
+        def close_without_reply():
+            conn, _ = server.accept()
+            conn.recv(1024)
+            conn.close()
+
+        thread = threading.Thread(target=close_without_reply)
+        thread.start()
+        with mock.patch.object(domain_checker, '_resolve_server',
+                               return_value=[(socket.AF_INET, server.getsockname())]):
+            results = domain_checker.bulk_whois('google', {'.com': 'whois.example'})
+        thread.join()
+        self.assertEqual(results['.com']['status'], 'Error')
+        self.assertEqual(results['.com']['message'], 'Empty reply from whois.example')
+
+
+@mock.patch.dict(os.environ, {domain_checker.BULK_API_KEY_ENV: 'test-key'})
+@mock.patch.object(domain_checker, 'is_unregistered_in_dns', lambda full_domain: False)
+class BulkApiTests(unittest.TestCase):
+
+    def test_results_are_mapped_and_gaps_fall_back_to_whois(self):
+        # .io is skipped and .dev cached, as without the API; .org is missing from the reply so it goes to WHOIS
+        response = {'domainsInfo': [
+            {'domainName': 'xn--bcher-kva.com', 'domainAvailability': 'UNAVAILABLE'},
+            {'domainName': 'xn--bcher-kva.net', 'domainAvailability': 'AVAILABLE'},
+        ]}
+        payloads = []
+
+        def urlopen(request, timeout):
+            payloads.append(json.loads(request.data))
+            return io.BytesIO(json.dumps(response).encode())
+
+        cached = {'status': 'Available', 'registrar': None, 'creation_date': None, 'updated_date': None,
+                  'message': None}
+        org = SimpleNamespace(domain_name='XN--BCHER-KVA.ORG', registrar='Example Registrar',
+                              creation_date=None, updated_date=None)
+        with mock.patch('urllib.request.urlopen', urlopen), \
+                mock.patch.object(domain_checker, 'get_cached_result',
+                                  lambda full_domain: cached if full_domain.endswith('.dev') else None), \
+                mock.patch.object(domain_checker, 'whois_lookup', return_value=org) as whois_lookup:
+            results = domain_checker.check_all_bulk('b\u00fccher', ['.com', '.net', '.io', '.dev', '.org'])
+        self.assertEqual(payloads[0]['domains'], ['xn--bcher-kva.com', 'xn--bcher-kva.net', 'xn--bcher-kva.org'])
+        whois_lookup.assert_called_once_with('b\u00fccher.org', '.org')
+        self.assertEqual([r['status'] for r in results], ['Registered', 'Available', 'Skipped', 'Available', 'Registered'])
+        self.assertEqual(results[4]['registrar'], 'Example Registrar')
+
+
+class WhoisServerTests(unittest.TestCase):
+
+    def setUp(self):
+        tmp_dir = tempfile.TemporaryDirectory()
+        self.addCleanup(tmp_dir.cleanup)
+        self.cache_file = os.path.join(tmp_dir.name, 'tlds.json')
+        for patcher in (mock.patch.object(domain_checker, 'TLD_SERVER_CACHE_FILE', self.cache_file),
+                        mock.patch.object(domain_checker, '_TLD_SERVER_CACHE', {}),
+                        mock.patch.object(domain_checker, 'SERVER_QUERY_INTERVAL', 0)):
+            patcher.start()
+            self.addCleanup(patcher.stop)
+
+    def test_empty_iana_referral_is_not_a_server(self):
+        reply = 'domain:       ZZ\n\nwhois:\nstatus:       ACTIVE\n'
+        with mock.patch.object(domain_checker, 'raw_whois', return_value=reply):
+            self.assertIsNone(domain_checker.whois_server('.zz'))
+
+    def test_bootstrap_is_saved_immediately(self):
+        # Pool workers never run atexit handlers, so the answer must be on disk right away;
+        # entries another run saved in the meantime are kept
+        with open(self.cache_file, 'w') as f:
+            json.dump({'.de': 'whois.denic.de'}, f)
+        reply = 'domain:       JP\n\nwhois:        whois.jprs.jp\n'
+        with mock.patch.object(domain_checker, 'raw_whois', return_value=reply):
+            self.assertEqual(domain_checker.whois_server('.jp'), 'whois.jprs.jp')
+        with open(self.cache_file) as f:
+            self.assertEqual(json.load(f), {'.de': 'whois.denic.de', '.jp': 'whois.jprs.jp'})
+
+
+class FastWhoisTests(unittest.TestCase):
+
+    def test_registered_reply(self):
+        w = domain_checker.fast_whois(
+            '   Domain Name: GOOGLE.COM\r\n'
+            '   Registrar: MarkMonitor Inc.\r\n'
+            '   Updated Date: 2019-09-09T15:39:04Z\r\n'
+            '   Creation Date: 1997-09-15T04:00:00Z\r\n')
+        self.assertEqual(w.domain_name, 'GOOGLE.COM')
+        self.assertEqual(w.registrar, 'MarkMonitor Inc.')
+        self.assertEqual(w.creation_date, datetime.datetime(1997, 9, 15, 4, tzinfo=datetime.timezone.utc))
+        self.assertEqual(w.updated_date, datetime.datetime(2019, 9, 9, 15, 39, 4, tzinfo=datetime.timezone.utc))
+
+    def test_verisign_no_match(self):
+        w = domain_checker.fast_whois('No match for "EXAMPLE-FREE.COM".\r\n>>> Last update of whois database: ...\r\n')
+        self.assertIsNone(w.domain_name)
+
+    def test_pir_domain_not_found(self):
+        w = domain_checker.fast_whois('Domain not found.\r\n>>> Last update of WHOIS database: ...\r\n')
+        self.assertIsNone(w.domain_name)
+
+    def test_empty_fields_dont_capture_the_next_line(self):
+        w = domain_checker.fast_whois(
+            'Domain Name: EXAMPLE.COM\r\n'
+            'Registrar:\r\n'
+            'Registrar IANA ID: 292\r\n'
+            'Updated Date:\r\n'
+            'Creation Date: 1997-09-15T04:00:00Z\r\n')
+        self.assertIsNone(w.registrar)
+        self.assertIsNone(w.updated_date)
+        self.assertEqual(w.creation_date, datetime.datetime(1997, 9, 15, 4, tzinfo=datetime.timezone.utc))
+
+    def test_unrecognized_reply(self):
+        self.assertIsNone(domain_checker.fast_whois('Please query the registrar WHOIS server.\r\n'))
+
+
+def fake_check_domain(domain_name, tld):
+    return {'status': 'Available', 'registrar': None, 'creation_date': None, 'updated_date': None,
+            'message': None}
+
+
+@mock.patch.object(domain_checker, 'check_domain', side_effect=fake_check_domain)
+class BatchModeTests(unittest.TestCase):
+
+    def setUp(self):
+        tmp_dir = tempfile.TemporaryDirectory()
+        self.addCleanup(tmp_dir.cleanup)
+        self.names_file = os.path.join(tmp_dir.name, 'names.txt')
+        self.output_file = os.path.join(tmp_dir.name, 'results.jsonl')
+        with open(self.names_file, 'w') as f:
+            f.write('# names to check\n\nExample\nexample\nfoo.org\n  foo.org  \n')
+
+    def read_lines(self, text):
+        # Results are written in completion order, so compare them sorted
+        return sorted((json.loads(line) for line in text.splitlines()), key=lambda r: r['domain'])
+
+    def test_results_are_written_as_json_lines(self, check_domain):
+        domain_checker.main(['--file', self.names_file, '--tlds', '.com net', '--output', self.output_file])
+        with open(self.output_file) as f:
+            results = self.read_lines(f.read())
+        # Base names get every TLD, full domains only their own; comments, blanks and duplicates are dropped
+        self.assertEqual(sorted(call.args for call in check_domain.call_args_list),
+                         [('example', '.com'), ('example', '.net'), ('foo', '.org')])
+        self.assertEqual([r['domain'] for r in results], ['example.com', 'example.net', 'foo.org'])
+        self.assertEqual(results[0], {'domain': 'example.com', 'status': 'Available', 'registrar': None,
+                                      'creation_date': None, 'updated_date': None, 'message': None})
+
+    def test_results_go_to_stdout_without_output(self, check_domain):
+        with mock.patch('sys.stdout', new_callable=io.StringIO) as stdout:
+            domain_checker.main(['--file', self.names_file])
+        self.assertEqual([r['domain'] for r in self.read_lines(stdout.getvalue())],
+                         ['example.com', 'example.net', 'example.org', 'foo.org'])
+
+    def test_output_requires_file(self, check_domain):
+        with mock.patch('sys.stderr', new_callable=io.StringIO), self.assertRaises(SystemExit) as cm:
+            domain_checker.parse_args(['--output', self.output_file])
+        self.assertEqual(cm.exception.code, 2)
+        self.assertFalse(os.path.exists(self.output_file))
+
+
+class FormatDateTests(unittest.TestCase):
+
+    def test_same_instant_in_different_offsets(self):
+        utc = datetime.datetime(2020, 1, 1, 5, tzinfo=datetime.timezone.utc)
+        plus8 = datetime.datetime(2020, 1, 1, 13, tzinfo=datetime.timezone(datetime.timedelta(hours=8)))
+        self.assertEqual(domain_checker.format_date(utc), '2020-01-01 05:00:00')
+        self.assertEqual(domain_checker.format_date(plus8), '2020-01-01 13:00:00')
+
+
+if __name__ == '__main__':
+    unittest.main()